@@ -1,4 +1,5 @@
 from .meme_engine import MemeEngine  # plus any concrete ingestors you want to expose
+from .render_cache import RenderCache
 
 
-__all__ = ["MemeEngine"]
+__all__ = ["MemeEngine", "RenderCache"]
@@ -1,23 +1,46 @@
 """Utilities for rendering memes with dynamically scaled text overlays."""
 
+import hashlib
 import random
+from functools import lru_cache
+from io import BytesIO
 from pathlib import Path
 
 from PIL import Image, ImageDraw, ImageFont
 
+from .render_cache import RenderCache
+
 ImageType = Image.Image
 
+FONT_FILE: Path = Path(__file__).resolve().parent / "fonts" / "arial.ttf"
+
+
+@lru_cache(maxsize=None)
+def _load_font(font_path: str, size: int) -> ImageFont.FreeTypeFont:
+    """Return a cached font face so repeated renders skip re-parsing the TTF file."""
+    return ImageFont.truetype(font_path, size=size)
+
 
 class MemeEngine:
     """Create captioned images using Pillow."""
 
-    def __init__(self, output_dir: str | None = None):
-        """Initialize MemeEngine with the output directory."""
+    def __init__(self, output_dir: str | None = None, cache: RenderCache | None = None):
+        """Initialize MemeEngine with the output directory and an optional render cache."""
         if output_dir is None:
             raise ValueError("output_dir must be provided")
         self.output_dir: Path = Path(output_dir)
         if not self.output_dir.exists():
             self.output_dir.mkdir(parents=True)
+        self.cache = cache
+
+    @staticmethod
+    def preload_fonts(width: int = 500, font_path: str | Path = FONT_FILE) -> None:
+        """Warm the font cache with every size ``text_scale`` can pick for ``width``.
+
+        Call this in a pre-fork master so workers inherit the parsed faces.
+        """
+        for size in range(19, max(33, width // 13) + 1):
+            _load_font(str(font_path), size)
 
     @staticmethod
     def scale_image(img: ImageType, width: int) -> ImageType:
@@ -40,10 +63,10 @@ class MemeEngine:
         spacing = 5
 
         lo, hi = 19, max(33, img_width // 13)
-        best_font = ImageFont.truetype(font_path, size=lo)
+        best_font = _load_font(str(font_path), lo)
         while lo <= hi:
             mid = (lo + hi) // 2
-            font = ImageFont.truetype(font_path, size=mid)
+            font = _load_font(str(font_path), mid)
             bbox = draw.multiline_textbbox((0, 0), text, font=font, spacing=spacing)
             text_w = bbox[2] - bbox[0]
             text_h = bbox[3] - bbox[1]
@@ -56,21 +79,16 @@ class MemeEngine:
                 hi = mid - 1  # too big; shrink
         return best_font
 
-    def make_meme(self, img_path: str, quote: str, author: str, width: int = 500) -> str:
-        """Create a meme with the given image and quote.
-
-        Args:
-            img_path (str): Source image path.
-            quote (str): Body text to render.
-            author (str): Author attribution.
-            width (int, optional): Target width for the output image. Defaults to 500.
-
-        Returns:
-            str: Filename of the generated meme relative to the output directory.
-        """
-
-        font_file = Path(__file__).resolve().parent.parent / "fonts" / "arial.ttf"
-
+    @staticmethod
+    def cache_key(img_path: str, quote: str, author: str, width: int) -> str:
+        """Return the content hash identifying a meme for the render cache."""
+        with open(img_path, "rb") as img_file:
+            digest = hashlib.file_digest(img_file, "sha256")
+        digest.update(f"\0{quote}\0{author}\0{width}".encode())
+        return digest.hexdigest()
+
+    def render(self, img_path: str, quote: str, author: str, width: int = 500) -> bytes:
+        """Draw the quote onto the image and return the JPEG-encoded result."""
         with Image.open(img_path) as img:
             img = MemeEngine.scale_image(img, width)
             draw = ImageDraw.Draw(img)
@@ -83,7 +101,7 @@ class MemeEngine:
             x = random.randint(width_margin, img.width - width_margin)
             y = random.randint(height_margin, img.height - height_margin)
             
-            font = MemeEngine.text_scale(draw, text, font_file, img.width, img.height)
+            font = MemeEngine.text_scale(draw, text, FONT_FILE, img.width, img.height)
 
             draw.multiline_text(
                 (x + 2, y + 2),
@@ -103,10 +121,52 @@ class MemeEngine:
                 spacing=5,
                 anchor="ma",
             )
-            file_name: str = f"temp_meme_{random.randint(1, 1_000_000)}.jpg"
-            output_path: Path = self.output_dir / file_name
-            img.save(output_path)
-            return file_name
+            buffer = BytesIO()
+            img.save(buffer, format="JPEG")
+            return buffer.getvalue()
+
+    def make_meme_bytes(
+        self, img_path: str, quote: str, author: str, width: int = 500
+    ) -> tuple[str | None, bytes]:
+        """Return a meme's JPEG bytes, rendering only on a cache miss.
+
+        A cached meme keeps the caption position it was first rendered with.
+
+        Returns:
+            tuple[str | None, bytes]: The cache key, or None when no cache is
+                configured or the meme was too large to store, and the JPEG bytes.
+        """
+        if self.cache is None:
+            return None, self.render(img_path, quote, author, width)
+
+        key = MemeEngine.cache_key(img_path, quote, author, width)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return key, cached
+        data = self.render(img_path, quote, author, width)
+        return (key if self.cache.put(key, data) else None), data
+
+    def save(self, data: bytes) -> str:
+        """Write encoded meme bytes to the output directory and return the filename."""
+        file_name: str = f"temp_meme_{random.randint(1, 1_000_000)}.jpg"
+        output_path: Path = self.output_dir / file_name
+        output_path.write_bytes(data)
+        return file_name
+
+    def make_meme(self, img_path: str, quote: str, author: str, width: int = 500) -> str:
+        """Create a meme with the given image and quote.
+
+        Args:
+            img_path (str): Source image path.
+            quote (str): Body text to render.
+            author (str): Author attribution.
+            width (int, optional): Target width for the output image. Defaults to 500.
+
+        Returns:
+            str: Filename of the generated meme relative to the output directory.
+        """
+        _, data = self.make_meme_bytes(img_path, quote, author, width)
+        return self.save(data)
 
 
 if __name__ == "__main__":
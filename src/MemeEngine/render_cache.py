@@ -0,0 +1,260 @@
+"""Memory-mapped render cache shared by every process on the host."""
+
+import mmap
+import os
+import struct
+import threading
+import weakref
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+try:  # pragma: no cover - fcntl is POSIX only
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None  # type: ignore[assignment]
+
+
+# Every open cache, so forked children can reopen them before any thread starts.
+_open_caches: "weakref.WeakSet[RenderCache]" = weakref.WeakSet()
+
+
+def _reopen_after_fork() -> None:
+    """Give each cache in a forked child its own descriptor and flock."""
+    for cache in list(_open_caches):
+        cache._reopen()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reopen_after_fork)
+
+
+class RenderCache:
+    """Fixed-size slab of encoded memes keyed by content hash.
+
+    The backing file holds a header, an index of ``slot_count`` entries and
+    ``slot_count`` data slots of ``slot_size`` bytes. Every worker maps the same
+    file, so a meme rendered by one process is served by all of them, and the
+    entries (plus hit/miss counters) survive worker restarts. Access is
+    serialized with ``flock`` across processes and a mutex across threads;
+    eviction uses the CLOCK algorithm. Requires POSIX; see ``is_supported``.
+    """
+
+    MAGIC: bytes = b"MEMECAC1"
+    _header = struct.Struct("<8sIIIQQ")  # magic, slot_count, slot_size, hand, hits, misses
+    _entry = struct.Struct("<32sIB3x")  # sha256 key, payload length, reference bit
+
+    def __init__(
+        self,
+        path: str | Path,
+        slot_count: int = 256,
+        slot_size: int = 256 * 1024,
+    ):
+        """Open the cache file at ``path``, creating it if needed.
+
+        Args:
+            path (str | Path): Location of the backing slab file.
+            slot_count (int, optional): Number of entries the cache can hold.
+                Defaults to 256.
+            slot_size (int, optional): Largest payload in bytes a slot accepts.
+                Defaults to 256 KiB.
+
+        Raises:
+            RuntimeError: On platforms without ``fcntl`` file locking.
+            ValueError: When the existing file was created with another geometry.
+        """
+        if not RenderCache.is_supported():
+            raise RuntimeError("RenderCache requires POSIX file locking (fcntl)")
+        if slot_count <= 0 or slot_size <= 0:
+            raise ValueError("slot_count and slot_size must be positive")
+        self.path: Path = Path(path)
+        self.slot_count = slot_count
+        self.slot_size = slot_size
+        self._index_offset = self._header.size
+        self._data_offset = self._index_offset + slot_count * self._entry.size
+        self._file_size = self._data_offset + slot_count * slot_size
+        self._open()
+        _open_caches.add(self)
+
+    @staticmethod
+    def is_supported() -> bool:
+        """Return whether this platform provides the locking the cache relies on."""
+        return fcntl is not None
+
+    # Internal helpers ---------------------------------------------------------------
+    def _open(self) -> None:
+        """Map the slab file, initializing it when it is new."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        self._thread_lock = threading.Lock()
+        try:
+            with self._locked():
+                self._initialize()
+        except BaseException:
+            os.close(self._fd)
+            raise
+        self._mm = mmap.mmap(self._fd, self._file_size)
+
+    def _initialize(self) -> None:
+        """Write a fresh header to a new file or validate an existing one.
+
+        A live file is never truncated: other workers may still map it, and
+        shrinking it under them would SIGBUS their next access.
+        """
+        expected = (self.MAGIC, self.slot_count, self.slot_size)
+        size = os.fstat(self._fd).st_size
+        header = os.pread(self._fd, self._header.size, 0)
+        # An all-zero header means a previous initialization died before writing it.
+        if size == 0 or (size == self._file_size and not any(header)):
+            os.ftruncate(self._fd, self._file_size)
+            os.pwrite(self._fd, self._header.pack(*expected, 0, 0, 0), 0)
+            return
+        if size != self._file_size or self._header.unpack(header)[:3] != expected:
+            raise ValueError(
+                f"{self.path} holds a render cache with a different layout; "
+                "remove it or choose another path"
+            )
+
+    def _reopen(self) -> None:
+        """Replace the descriptor and mapping inherited from a parent process.
+
+        An inherited descriptor shares its ``flock`` with the parent, so it would
+        not exclude the parent or sibling workers. Runs single-threaded in the
+        child straight after ``fork()``.
+        """
+        # The parent already validated the file; skip the flock so the child never
+        # blocks on another process before it starts serving.
+        self._mm.close()
+        os.close(self._fd)
+        self._fd = os.open(self.path, os.O_RDWR)
+        self._thread_lock = threading.Lock()
+        self._mm = mmap.mmap(self._fd, self._file_size)
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        """Hold the thread mutex and an exclusive ``flock`` on the slab file."""
+        with self._thread_lock:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def _read_header(self) -> tuple[int, int, int]:
+        """Return the CLOCK hand and the hit and miss counters."""
+        return self._header.unpack_from(self._mm, 0)[3:]
+
+    def _write_header(self, hand: int, hits: int, misses: int) -> None:
+        """Persist the CLOCK hand and counters."""
+        self._header.pack_into(
+            self._mm, 0, self.MAGIC, self.slot_count, self.slot_size, hand, hits, misses
+        )
+
+    def _entry_offset(self, slot: int) -> int:
+        """Return the byte offset of ``slot``'s index entry."""
+        return self._index_offset + slot * self._entry.size
+
+    def _find(self, digest: bytes) -> int | None:
+        """Return the slot holding ``digest`` or None."""
+        index_end = self._data_offset
+        pos = self._mm.find(digest, self._index_offset, index_end)
+        while pos != -1:
+            slot, misaligned = divmod(pos - self._index_offset, self._entry.size)
+            if not misaligned:
+                _, length, _ = self._entry.unpack_from(self._mm, pos)
+                if length:
+                    return slot
+            pos = self._mm.find(digest, pos + 1, index_end)
+        return None
+
+    def _victim(self, hand: int) -> tuple[int, int]:
+        """Advance the CLOCK hand to a slot that may be overwritten."""
+        while True:
+            offset = self._entry_offset(hand)
+            key, length, referenced = self._entry.unpack_from(self._mm, offset)
+            if length and referenced:
+                self._entry.pack_into(self._mm, offset, key, length, 0)
+                hand = (hand + 1) % self.slot_count
+                continue
+            return hand, (hand + 1) % self.slot_count
+
+    # Public API ---------------------------------------------------------------------
+    def get(self, key: str, record: bool = True) -> bytes | None:
+        """Return the cached payload for ``key`` or None on a miss.
+
+        The payload is copied out of the mapping while the lock is held, as the
+        slot may be evicted by another worker once it is released.
+
+        Args:
+            key (str): Hex content hash of the entry.
+            record (bool, optional): Count the lookup towards the hit ratio.
+                Defaults to True.
+        """
+        try:
+            digest = bytes.fromhex(key)
+        except ValueError:
+            return None
+        with self._locked():
+            hand, hits, misses = self._read_header()
+            slot = self._find(digest)
+            if slot is None:
+                if record:
+                    self._write_header(hand, hits, misses + 1)
+                return None
+            offset = self._entry_offset(slot)
+            _, length, _ = self._entry.unpack_from(self._mm, offset)
+            self._entry.pack_into(self._mm, offset, digest, length, 1)
+            if record:
+                self._write_header(hand, hits + 1, misses)
+            start = self._data_offset + slot * self.slot_size
+            return self._mm[start : start + length]
+
+    def put(self, key: str, data: bytes) -> bool:
+        """Store ``data`` under ``key``, evicting an entry if the slab is full.
+
+        Returns:
+            bool: False when the payload is larger than a slot and was not cached.
+        """
+        if len(data) > self.slot_size:
+            return False
+        digest = bytes.fromhex(key)
+        with self._locked():
+            if self._find(digest) is not None:
+                return True
+            hand, hits, misses = self._read_header()
+            slot, hand = self._victim(hand)
+            offset = self._entry_offset(slot)
+            # Invalidate first so a crash mid-write never exposes a torn payload.
+            self._entry.pack_into(self._mm, offset, bytes(32), 0, 0)
+            start = self._data_offset + slot * self.slot_size
+            self._mm[start : start + len(data)] = data
+            self._entry.pack_into(self._mm, offset, digest, len(data), 1)
+            self._write_header(hand, hits, misses)
+        return True
+
+    def __contains__(self, key: str) -> bool:
+        """Check for ``key`` without touching the counters or reference bits."""
+        try:
+            digest = bytes.fromhex(key)
+        except ValueError:
+            return False
+        with self._locked():
+            return self._find(digest) is not None
+
+    def stats(self) -> dict[str, float]:
+        """Return entry count, hits, misses and hit ratio across all workers."""
+        with self._locked():
+            _, hits, misses = self._read_header()
+            entries = sum(
+                1
+                for slot in range(self.slot_count)
+                if self._entry.unpack_from(self._mm, self._entry_offset(slot))[1]
+            )
+        lookups = hits + misses
+        return {
+            "entries": entries,
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": hits / lookups if lookups else 0.0,
+        }
+
@@ -1,27 +1,40 @@
 """Flask routes for generating and rendering motivational memes."""
 
+import contextlib
+import gc
 import glob
+import logging
 import os
 import random
 from io import BytesIO
 from pathlib import Path
 
 import requests
-from flask import Flask, abort, render_template, request, url_for
+from flask import (
+    Flask,
+    Response,
+    abort,
+    current_app,
+    jsonify,
+    render_template,
+    request,
+    url_for,
+)
+from flask.logging import default_handler
 from PIL import Image
 
 try:  # pragma: no cover - support both package and script execution contexts
-    from .MemeEngine import MemeEngine
+    from .MemeEngine import MemeEngine, RenderCache
     from .QuoteEngine import Ingestor, Quote
 except ImportError:  # pragma: no cover
-    from MemeEngine import MemeEngine  # type: ignore
+    from MemeEngine import MemeEngine, RenderCache  # type: ignore
     from QuoteEngine import Ingestor, Quote  # type: ignore
 
 
-app = Flask(__name__)
+logger = logging.getLogger(__name__)
 
-# Use the static directory so generated memes are directly accessible by templates.
-meme = MemeEngine(app.static_folder)
+# Per-process state that must never be inherited across fork(); see _init_worker.
+_http_session: requests.Session = requests.Session()
 
 
 # Helper utilities -----------------------------------------------------------------
@@ -54,6 +67,39 @@ def setup() -> tuple[list[Quote], list[str]]:
     return quotes, images
 
 
+def unique_rss_kib() -> int | None:
+    """Return this process's unique set size (private pages) in KiB.
+
+    Shared copy-on-write pages inherited from a pre-fork master are excluded, so the
+    value shows what each worker really costs. Returns ``None`` where
+    ``/proc/self/smaps_rollup`` is unavailable (non-Linux platforms).
+    """
+    try:
+        with open("/proc/self/smaps_rollup", "r", encoding="ascii") as smaps:
+            private = [
+                int(line.split()[1])
+                for line in smaps
+                if line.startswith(("Private_Clean:", "Private_Dirty:"))
+            ]
+    except OSError:
+        return None
+    return sum(private)
+
+
+def _init_worker() -> None:
+    """Reset per-process state; runs in the current process and after every fork."""
+    global _http_session
+    # Forked workers inherit the master's RNG state and would emit identical memes.
+    random.seed()
+    # Sockets in a pooled session must not be shared between processes.
+    _http_session = requests.Session()
+    logger.info("Process %d initialized, unique RSS: %s KiB", os.getpid(), unique_rss_kib())
+
+
+if hasattr(os, "register_at_fork"):  # POSIX only; Windows never forks workers
+    os.register_at_fork(after_in_child=_init_worker)
+
+
 def image_verification(response: requests.Response) -> None:
     """Verify that the HTTP response contains a valid image payload.
 
@@ -115,36 +161,60 @@ def render_meme(img_path: Path | str, body: str, author: str):
     Returns:
         flask.Response: A rendered meme page with a generated image URL.
     """
+    meme: MemeEngine = current_app.extensions["meme_engine"]
+    key, data = meme.make_meme_bytes(str(img_path), body, author, 500)
+    if key is not None:
+        # Serve straight from the shared cache; no per-request file is written. The
+        # entry was just referenced, so CLOCK has to sweep past it twice before it
+        # can be evicted ahead of the browser's image request.
+        return render_template("meme.html", meme_url=url_for("cached_meme", key=key))
+
     # Clear previous generated artifacts so the static folder only holds the newest meme.
     for file_path in glob.glob("./src/static/temp_meme_*.jpg"):
-        os.remove(file_path)
+        # Another worker process may have removed it between glob and remove.
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(file_path)
 
-    output_path = meme.make_meme(str(img_path), body, author, 500)
+    output_path = meme.save(data)
     meme_url = url_for("static", filename=output_path)
     return render_template("meme.html", meme_url=meme_url)
 
 
-# Preload the core resources once Flask starts.
-quotes, imgs = setup()
-
-
 # Flask routes ---------------------------------------------------------------------
-@app.route("/")
 def meme_rand():
     """Generate a random meme from the preloaded resources."""
-
+    quotes, imgs = current_app.extensions["meme_resources"]
     img = random.choice(imgs)
     quote = random.choice(quotes)
     return render_meme(img, quote.body, quote.author)
 
 
-@app.route("/create", methods=["GET"])
+def cached_meme(key: str):
+    """Serve an encoded meme from the shared render cache."""
+    cache: RenderCache | None = current_app.extensions["meme_engine"].cache
+    data = cache.get(key, record=False) if cache is not None else None
+    if data is None:
+        abort(404)
+    # Keys are content hashes, so a given URL always maps to the same image.
+    response = Response(data, mimetype="image/jpeg")
+    response.cache_control.public = True
+    response.cache_control.max_age = 86400
+    return response
+
+
+def cache_stats():
+    """Report hit ratio and occupancy of the shared render cache."""
+    cache: RenderCache | None = current_app.extensions["meme_engine"].cache
+    if cache is None:
+        abort(404, description="Render cache is disabled")
+    return jsonify(cache.stats())
+
+
 def meme_form():
     """Display the meme creation form for user-supplied content."""
     return render_template("meme_form.html")
 
 
-@app.route("/create", methods=["POST"])
 def meme_post():
     """Create a user-defined meme using data submitted from the form."""
     requested_image_url: str | None = request.form.get("image_url")
@@ -158,7 +228,7 @@ def meme_post():
     )
 
     try:
-        response = requests.get(verified_url, timeout=4)
+        response = _http_session.get(verified_url, timeout=4)
         response.raise_for_status()
     except requests.exceptions.RequestException as exc:
         abort(400, description=f"Unable to download image: {exc}")
@@ -176,7 +246,67 @@ def meme_post():
     return render
 
 
+# Application factory ---------------------------------------------------------------
+def create_app(
+    preload: bool = False,
+    cache_path: str | Path | None = "./src/.tmp/render_cache.bin",
+) -> Flask:
+    """Build the Flask application and load its quote, image and font resources.
+
+    Args:
+        preload (bool, optional): Set when a pre-fork server imports the app once in
+            its master (e.g. ``gunicorn --preload``). Everything loaded here is then
+            moved to the permanent GC generation with ``gc.freeze()`` so the
+            collector never writes to those objects and workers keep sharing the
+            pages copy-on-write. Defaults to False.
+        cache_path (str | Path | None, optional): Slab file backing the render
+            cache shared by all workers; ``None`` disables caching, as does a
+            platform without ``fcntl``. Defaults to
+            ``./src/.tmp/render_cache.bin``.
+
+    Returns:
+        Flask: The configured application.
+    """
+    if not logger.hasHandlers():
+        # Neither gunicorn nor ``app.run`` configures app loggers; make the RSS
+        # report visible on stderr unless the deployment set up logging itself.
+        logger.addHandler(default_handler)
+        logger.setLevel(logging.INFO)
+
+    rss_before = unique_rss_kib()
+    app = Flask(__name__)
+
+    cache = None
+    if cache_path is not None and RenderCache.is_supported():
+        cache = RenderCache(cache_path)
+    # Use the static directory so generated memes are directly accessible by templates.
+    app.extensions["meme_engine"] = MemeEngine(app.static_folder, cache=cache)
+    quotes, imgs = setup()
+    # Tuples make the shared corpus read-only for request handlers.
+    app.extensions["meme_resources"] = (tuple(quotes), tuple(imgs))
+    MemeEngine.preload_fonts(500)
+
+    app.add_url_rule("/", view_func=meme_rand)
+    app.add_url_rule("/create", view_func=meme_form, methods=["GET"])
+    app.add_url_rule("/create", view_func=meme_post, methods=["POST"])
+    app.add_url_rule("/memes/<key>.jpg", view_func=cached_meme)
+    app.add_url_rule("/cache/stats", view_func=cache_stats)
+
+    if preload:
+        gc.collect()
+        gc.freeze()
+    _init_worker()
+    logger.info(
+        "Resources loaded (preload=%s), unique RSS: %s KiB before, %s KiB after",
+        preload,
+        rss_before,
+        unique_rss_kib(),
+    )
+    return app
+
+
 if __name__ == "__main__":
+    app = create_app()
     app.run(
         host="0.0.0.0",
         port=5000,
@@ -0,0 +1,135 @@
+"""Tests for the memory-mapped render cache."""
+
+import fcntl
+import os
+import threading
+
+import pytest
+
+from src.MemeEngine import RenderCache
+
+
+def key(char: str) -> str:
+    """Return a valid hex cache key made of one repeated character."""
+    return char * 64
+
+
+def wait_ok(pid: int) -> bool:
+    """Wait for a forked child and report whether it exited cleanly."""
+    _, status = os.waitpid(pid, 0)
+    return os.WIFEXITED(status) and os.WEXITSTATUS(status) == 0
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    return tmp_path / "render_cache.bin"
+
+
+def test_put_get_round_trip(cache_path):
+    cache = RenderCache(cache_path, slot_count=4, slot_size=64)
+
+    assert cache.put(key("a"), b"jpeg bytes")
+    assert cache.get(key("a")) == b"jpeg bytes"
+    assert cache.get(key("b")) is None
+    assert cache.get("not hex") is None
+
+
+def test_payload_larger_than_slot_is_rejected(cache_path):
+    cache = RenderCache(cache_path, slot_count=4, slot_size=8)
+
+    assert not cache.put(key("a"), b"x" * 9)
+    assert key("a") not in cache
+    assert cache.put(key("b"), b"x" * 8)
+
+
+def test_clock_evicts_unreferenced_entries_first(cache_path):
+    cache = RenderCache(cache_path, slot_count=3, slot_size=8)
+    for char in "abc":
+        cache.put(key(char), char.encode())
+
+    # Every entry is referenced, so the hand clears all bits and evicts the oldest.
+    cache.put(key("d"), b"d")
+    assert [c for c in "abcd" if key(c) in cache] == ["b", "c", "d"]
+
+    # A lookup protects "c"; the hand now stops at the unreferenced "b".
+    cache.get(key("c"))
+    cache.put(key("e"), b"e")
+    assert [c for c in "bcde" if key(c) in cache] == ["c", "d", "e"]
+
+
+def test_counters_and_entries_persist_across_reopen(cache_path):
+    cache = RenderCache(cache_path, slot_count=4, slot_size=64)
+    cache.put(key("a"), b"payload")
+    cache.get(key("a"))
+    cache.get(key("a"))
+    cache.get(key("b"))
+    cache.get(key("a"), record=False)
+    del cache
+
+    reopened = RenderCache(cache_path, slot_count=4, slot_size=64)
+    stats = reopened.stats()
+    assert (stats["entries"], stats["hits"], stats["misses"]) == (1, 2, 1)
+    assert stats["hit_ratio"] == pytest.approx(2 / 3)
+    assert reopened.get(key("a")) == b"payload"
+
+
+def test_mismatched_geometry_refuses_to_open(cache_path):
+    cache = RenderCache(cache_path, slot_count=4, slot_size=64)
+    cache.put(key("a"), b"payload")
+
+    with pytest.raises(ValueError):
+        RenderCache(cache_path, slot_count=8, slot_size=64)
+    assert cache.get(key("a")) == b"payload"
+
+
+def test_forked_child_gets_its_own_lock(cache_path):
+    cache = RenderCache(cache_path, slot_count=4, slot_size=64)
+    cache.put(key("a"), b"from parent")
+
+    with cache._locked():
+        pid = os.fork()
+        if pid == 0:
+            try:
+                # The parent holds the flock, so a reopened descriptor must not get it.
+                fcntl.flock(cache._fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                os._exit(0)
+            os._exit(1)
+        assert wait_ok(pid)
+
+    pid = os.fork()
+    if pid == 0:
+        ok = cache.get(key("a")) == b"from parent" and cache.put(key("b"), b"from child")
+        os._exit(0 if ok else 1)
+    assert wait_ok(pid)
+    assert cache.get(key("b")) == b"from child"
+
+
+def test_threads_in_forked_child_share_reopened_cache(cache_path):
+    cache = RenderCache(cache_path, slot_count=4, slot_size=64)
+    cache.put(key("a"), b"payload")
+
+    def child() -> None:
+        errors: list[BaseException] = []
+
+        def lookup() -> None:
+            try:
+                if cache.get(key("a")) != b"payload":
+                    raise AssertionError("wrong payload")
+            except BaseException as exc:  # noqa: BLE001 - reported via exit code
+                errors.append(exc)
+
+        threads = [threading.Thread(target=lookup) for _ in range(16)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        os._exit(1 if errors else 0)
+
+    pids = []
+    for _ in range(50):
+        pid = os.fork()
+        if pid == 0:
+            child()
+        pids.append(pid)
+    assert all(wait_ok(pid) for pid in pids)